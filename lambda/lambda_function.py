@@ -1,21 +1,121 @@
+import base64
 import json
 import logging
 import os
-import boto3
-import urllib3
 import ssl
-from datetime import datetime
+import threading
+import time
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# orjson is used when it is vendored into the deployment package; the stock
+# Lambda runtime only ships the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# msgspec, when vendored, decodes pod lists straight into typed structs
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Deployment configuration, resolved once per container
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+CLUSTER_NAME = os.environ.get('CLUSTER_NAME', 'test-cluster-production')
 
 # Set up logging
 logger = logging.getLogger()
-logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+logger.setLevel(LOG_LEVEL)
+
+# Clients are created once per container and reused across warm invocations.
+# AWS clients are built lazily since warm invocations hit the in-process caches;
+# cluster worker threads may race to create them, so creation is serialized.
+_BOTO3_SESSION = None
+_EKS_CLIENT = None
+_DYNAMODB_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_HTTP_POOL_OPTIONS = {
+    'num_pools': 4,
+    'maxsize': 16,
+    'retries': urllib3.Retry(total=2, backoff_factor=0.1)
+}
+_HTTP = urllib3.PoolManager(**_HTTP_POOL_OPTIONS)
+
+# One pool per cluster CA bundle, each verifying against that cluster's CA
+_CLUSTER_HTTP = {}
+
+# EKS endpoint/CA per cluster as (fetched_at, (endpoint, ca)), refreshed after the TTL
+_CLUSTER_INFO = {}
+_CLUSTER_INFO_TTL_SECONDS = 3600
+
+# DynamoDB table the token refresher writes service account tokens to.
+# Tokens are kept in-process as (fetched_at, token) per cluster for a short TTL,
+# and KUBERNETES_TOKEN is used when the table has no valid entry.
+_TOKEN_CACHE_TABLE = os.environ.get('TOKEN_CACHE_TABLE')
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_TTL_SECONDS = 300
+
+# Upper bound on concurrent per-cluster API calls
+_MAX_CLUSTER_WORKERS = 8
+
+# Page size for Kubernetes list calls
+_LIST_PAGE_SIZE = 500
+
+if msgspec is not None:
+    class _PodMeta(msgspec.Struct):
+        name: str
+        namespace: str
+        creationTimestamp: str
+
+    class _PodStatus(msgspec.Struct):
+        phase: str
+
+    class _PodSpec(msgspec.Struct):
+        nodeName: str = 'Unknown'
+
+    class _Pod(msgspec.Struct):
+        metadata: _PodMeta
+        status: _PodStatus
+        spec: _PodSpec
+
+    class _ListMeta(msgspec.Struct):
+        continue_: str = msgspec.field(default='', name='continue')
+
+    class _PodList(msgspec.Struct):
+        items: list[_Pod] = []
+        metadata: _ListMeta = msgspec.field(default_factory=_ListMeta)
+
+def _dumps(obj):
+    """Serialize obj to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def _loads(data):
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def lambda_handler(event, context):
     """
     Main Lambda handler for Bedrock Agent Kubernetes tools
     """
+    # Ping from the token refresher: drop in-process tokens so the next call rereads the cache
+    if event.get('refresh_token'):
+        _TOKEN_CACHE.clear()
+        logger.info("Cleared in-process token cache")
+        return {'message': 'Token cache cleared'}
+    
+    # One timestamp per invocation, shared by every response built below
+    timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", _dumps(event))
         
         # Extract information from Bedrock Agent event
         action_group = event.get('actionGroup', '')
@@ -23,228 +123,418 @@ def lambda_handler(event, context):
         http_method = event.get('httpMethod', '')
         input_text = event.get('inputText', '')
         
-        logger.info(f"Action Group: {action_group}")
-        logger.info(f"API Path: {api_path}")
-        logger.info(f"HTTP Method: {http_method}")
-        logger.info(f"Input Text: {input_text}")
+        logger.info("Action Group: %s", action_group)
+        logger.info("API Path: %s", api_path)
+        logger.info("HTTP Method: %s", http_method)
+        logger.info("Input Text: %s", input_text)
         
         # Extract parameters from request body
-        parameters = {}
-        request_body = event.get('requestBody', {})
-        if request_body and 'content' in request_body:
-            content = request_body['content']
-            if 'application/json' in content:
-                properties = content['application/json'].get('properties', [])
-                for prop in properties:
-                    if 'name' in prop and 'value' in prop:
-                        parameters[prop['name']] = prop['value']
+        parameters = {
+            prop['name']: prop['value']
+            for prop in (event.get('requestBody') or {}).get('content', {}).get('application/json', {}).get('properties', [])
+            if 'name' in prop and 'value' in prop
+        }
         
-        logger.info(f"Extracted Parameters: {parameters}")
+        logger.info("Extracted Parameters: %s", parameters)
         
         # Define clusters to check
-        clusters = [os.environ.get('CLUSTER_NAME', 'test-cluster-production')]
-        logger.info(f"Clusters to check: {clusters}")
+        clusters = [CLUSTER_NAME]
+        logger.info("Clusters to check: %s", clusters)
         
         # Route to appropriate function based on API path
-        if api_path == '/get-pods':
-            namespace = parameters.get('namespace', '')
-            logger.info(f"Calling get_pods_from_cluster with namespace: '{namespace}'")
-            result = get_pods_from_cluster(clusters, namespace)
-        elif api_path == '/analyze-namespace':
-            namespace = parameters.get('namespace', '')
-            logger.info(f"Calling get_cluster_data_with_real_kubernetes_api for path: {api_path}")
-            result = get_cluster_data_with_real_kubernetes_api(clusters, namespace)
-        elif api_path == '/get-cluster-health':
-            logger.info(f"Calling get_cluster_data_with_real_kubernetes_api for path: {api_path}")
-            result = get_cluster_data_with_real_kubernetes_api(clusters)
-        elif api_path == '/check-nodes':
-            result = check_nodes(clusters)
-        elif api_path == '/describe-pod':
-            pod_name = parameters.get('pod_name', '')
-            namespace = parameters.get('namespace', 'default')
-            result = describe_pod(clusters, pod_name, namespace)
-        else:
+        handler, param_defaults = _ROUTES.get(api_path, (None, None))
+        if handler is None:
             result = {
                 'error': f'Unknown API path: {api_path}',
-                'available_paths': ['/get-pods', '/analyze-namespace', '/get-cluster-health', '/check-nodes', '/describe-pod']
+                'available_paths': list(_ROUTES)
             }
+        else:
+            args = [parameters.get(name, default) for name, default in param_defaults]
+            logger.info("Calling %s for path: %s with args: %s", handler.__name__, api_path, args)
+            result = handler(clusters, *args, timestamp=timestamp)
         
-        logger.info(f"Function result keys: {list(result.keys())}")
-        logger.info(f"Responding with API Path: {api_path}")
+        logger.info("Function result keys: %s", list(result.keys()))
+        logger.info("Responding with API Path: %s", api_path)
         
         # Return response in Bedrock Agent format
-        return {
-            'messageVersion': '1.0',
-            'response': {
-                'actionGroup': action_group,
-                'apiPath': api_path,
-                'httpMethod': http_method,
-                'httpStatusCode': 200,
-                'responseBody': {
-                    'application/json': {
-                        'body': json.dumps(result)
-                    }
-                }
-            }
-        }
+        return _bedrock_response(action_group, api_path, http_method, 200, result)
         
     except Exception as e:
-        logger.error(f"Error in lambda_handler: {str(e)}")
-        return {
-            'messageVersion': '1.0',
-            'response': {
-                'actionGroup': action_group,
-                'apiPath': api_path,
-                'httpMethod': http_method,
-                'httpStatusCode': 500,
-                'responseBody': {
-                    'application/json': {
-                        'body': json.dumps({
-                            'error': str(e),
-                            'timestamp': datetime.utcnow().isoformat()
-                        })
-                    }
+        logger.error("Error in lambda_handler: %s", e)
+        return _bedrock_response(action_group, api_path, http_method, 500, {
+            'error': str(e),
+            'timestamp': timestamp
+        })
+
+def _bedrock_response(action_group, api_path, http_method, status_code, body):
+    """Wrap a JSON-serializable body in the Bedrock Agent action group response format"""
+    return {
+        'messageVersion': '1.0',
+        'response': {
+            'actionGroup': action_group,
+            'apiPath': api_path,
+            'httpMethod': http_method,
+            'httpStatusCode': status_code,
+            'responseBody': {
+                'application/json': {
+                    'body': _dumps(body)
                 }
             }
         }
+    }
+
+def _map_clusters(func, clusters, *args):
+    """Run func(cluster_name, *args) for every cluster concurrently, preserving order"""
+    workers = max(1, min(len(clusters), _MAX_CLUSTER_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda cluster_name: func(cluster_name, *args), clusters))
+
+def _new_client(service_name):
+    """Create an AWS client from the shared session, importing boto3 on first use.
+    
+    Callers must hold _CLIENT_LOCK; boto3 sessions are not safe for
+    concurrent client creation.
+    """
+    global _BOTO3_SESSION
+    import boto3
+    from botocore.config import Config
+    if _BOTO3_SESSION is None:
+        _BOTO3_SESSION = boto3.session.Session()
+    return _BOTO3_SESSION.client(service_name, config=Config(tcp_keepalive=True))
+
+def _get_eks_client():
+    """Return the shared EKS client"""
+    global _EKS_CLIENT
+    if _EKS_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _EKS_CLIENT is None:
+                _EKS_CLIENT = _new_client('eks')
+    return _EKS_CLIENT
+
+def _get_dynamodb_client():
+    """Return the shared DynamoDB client"""
+    global _DYNAMODB_CLIENT
+    if _DYNAMODB_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _DYNAMODB_CLIENT is None:
+                _DYNAMODB_CLIENT = _new_client('dynamodb')
+    return _DYNAMODB_CLIENT
+
+def _get_cached_token(cluster_name):
+    """Get the cluster's service account token from the in-process cache, then the DynamoDB cache"""
+    cached = _TOKEN_CACHE.get(cluster_name)
+    if cached and time.monotonic() - cached[0] < _TOKEN_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    if not _TOKEN_CACHE_TABLE:
+        return None
+    
+    try:
+        item = _get_dynamodb_client().get_item(
+            TableName=_TOKEN_CACHE_TABLE,
+            Key={'CacheKey': {'S': f"{cluster_name}:token"}}
+        ).get('Item')
+    except Exception as e:
+        logger.warning("Error reading token cache: %s", e)
+        return None
+    
+    # DynamoDB TTL deletion is lazy, so check expiry explicitly; tokens that never
+    # expire are stored without ExpiresAt
+    if not item or ('ExpiresAt' in item and int(item['ExpiresAt']['N']) <= time.time()):
+        return None
+    
+    token = item['Token']['S']
+    _TOKEN_CACHE[cluster_name] = (time.monotonic(), token)
+    return token
+
+def _get_cluster_http(cluster_ca):
+    """Return a pool whose TLS context trusts the given base64 cluster CA"""
+    http = _CLUSTER_HTTP.get(cluster_ca)
+    if http is None:
+        ssl_context = ssl.create_default_context(cadata=base64.b64decode(cluster_ca).decode('ascii'))
+        http = _CLUSTER_HTTP.setdefault(
+            cluster_ca, urllib3.PoolManager(ssl_context=ssl_context, **_HTTP_POOL_OPTIONS)
+        )
+    return http
 
 def get_kubernetes_config(cluster_name):
     """Get Kubernetes cluster configuration"""
     try:
-        # Get cluster info from EKS
-        eks_client = boto3.client('eks')
-        cluster_info = eks_client.describe_cluster(name=cluster_name)
-        
-        cluster_endpoint = cluster_info['cluster']['endpoint']
-        cluster_ca = cluster_info['cluster']['certificateAuthority']['data']
+        # Get cluster info from EKS (cached per container)
+        cached = _CLUSTER_INFO.get(cluster_name)
+        if cached and time.monotonic() - cached[0] < _CLUSTER_INFO_TTL_SECONDS:
+            cluster_endpoint, cluster_ca = cached[1]
+        else:
+            cluster_info = _get_eks_client().describe_cluster(name=cluster_name)
+            cluster_endpoint = cluster_info['cluster']['endpoint']
+            cluster_ca = cluster_info['cluster']['certificateAuthority']['data']
+            _CLUSTER_INFO[cluster_name] = (time.monotonic(), (cluster_endpoint, cluster_ca))
         
-        # Get token from environment variable
-        token = os.environ.get('KUBERNETES_TOKEN')
+        # Get token from the shared token cache, falling back to the environment variable
+        token = _get_cached_token(cluster_name) or os.environ.get('KUBERNETES_TOKEN')
         if not token:
-            logger.error("No KUBERNETES_TOKEN environment variable found")
+            logger.error("No token found in the token cache or KUBERNETES_TOKEN environment variable")
             return None, None, None
         
-        logger.info(f"Using service account token (length: {len(token)})")
+        logger.info("Using service account token (length: %d)", len(token))
         
         return cluster_endpoint, cluster_ca, token
         
     except Exception as e:
-        logger.error(f"Error getting Kubernetes config: {str(e)}")
+        logger.error("Error getting Kubernetes config: %s", e)
         return None, None, None
 
-def make_k8s_request(url, token, method='GET', data=None):
-    """Make HTTP request to Kubernetes API using urllib3"""
+def make_k8s_request(url, token, method='GET', data=None, params=None, cluster_ca=None, decode_type=None):
+    """Make HTTP request to Kubernetes API using urllib3
+    
+    With decode_type (a msgspec Struct), the body is decoded into that type
+    instead of plain dicts. Transport and API errors return None; a body
+    that doesn't decode raises, like a missing field does on the dict path.
+    """
     try:
-        http = urllib3.PoolManager(cert_reqs='CERT_NONE', assert_hostname=False)
+        http = _get_cluster_http(cluster_ca) if cluster_ca else _HTTP
         headers = {
             'Authorization': f'Bearer {token}',
             'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
             'Content-Type': 'application/json'
         }
         
         if method == 'GET':
-            response = http.request('GET', url, headers=headers, timeout=30)
+            response = http.request('GET', url, fields=params, headers=headers, timeout=30.0,
+                                     preload_content=False)
         elif method == 'POST':
-            response = http.request('POST', url, headers=headers, body=json.dumps(data), timeout=30)
+            response = http.request('POST', url, headers=headers, body=_dumps(data), timeout=30.0,
+                                     preload_content=False)
         else:
             raise ValueError(f"Unsupported method: {method}")
         
-        if response.status == 200 or response.status == 201:
-            return json.loads(response.data.decode('utf-8'))
-        else:
-            logger.error(f"K8s API error: {response.status} - {response.data.decode('utf-8')}")
-            return None
+        # Read the raw body once and parse the bytes directly, without an
+        # intermediate decoded string copy
+        try:
+            body = response.read()
+        finally:
+            response.release_conn()
             
     except Exception as e:
-        logger.error(f"Error making K8s request: {str(e)}")
+        logger.error("Error making K8s request: %s", e)
+        return None
+    
+    if response.status == 200 or response.status == 201:
+        if decode_type is not None:
+            return msgspec.json.decode(body, type=decode_type)
+        return _loads(body)
+    else:
+        logger.error("K8s API error: %s - %s", response.status, body.decode('utf-8', errors='replace'))
         return None
 
-def get_pods_from_cluster(clusters, namespace=""):
+def _list_k8s_items(url, token, cluster_ca, params=None, decode_type=None):
+    """List every item of a Kubernetes collection, following continue tokens.
+    
+    The first page is read with resourceVersion=0 so the API server answers
+    from its watch cache instead of a quorum read against etcd.
+    Returns None if any page could not be fetched.
+    """
+    query = {'limit': _LIST_PAGE_SIZE, 'resourceVersion': '0', **(params or {})}
+    items = []
+    while True:
+        page = make_k8s_request(url, token, params=query, cluster_ca=cluster_ca, decode_type=decode_type)
+        if not page:
+            return None
+        
+        if decode_type is not None:
+            items.extend(page.items)
+            continue_token = page.metadata.continue_
+        else:
+            items.extend(page.get('items', []))
+            continue_token = page.get('metadata', {}).get('continue')
+        if not continue_token:
+            return items
+        
+        # resourceVersion may not be combined with a continue token
+        query = {k: v for k, v in query.items() if k != 'resourceVersion'}
+        query['continue'] = continue_token
+
+def _list_pods(cluster_endpoint, cluster_ca, token, namespace=""):
+    """List pods from a cluster API endpoint, or None if the request failed"""
+    # Build API URL
+    if namespace:
+        api_url = f"{cluster_endpoint}/api/v1/namespaces/{namespace}/pods"
+    else:
+        api_url = f"{cluster_endpoint}/api/v1/pods"
+    
+    logger.info("Getting pods from: %s", api_url)
+    
+    if msgspec is not None:
+        pods = _list_k8s_items(api_url, token, cluster_ca, decode_type=_PodList)
+        if pods is None:
+            return None
+        
+        return [
+            {
+                'name': pod.metadata.name,
+                'namespace': pod.metadata.namespace,
+                'status': pod.status.phase,
+                'node': pod.spec.nodeName,
+                'created': pod.metadata.creationTimestamp
+            }
+            for pod in pods
+        ]
+    
+    pods = _list_k8s_items(api_url, token, cluster_ca)
+    if pods is None:
+        return None
+    
+    return [
+        {
+            'name': (meta := pod['metadata'])['name'],
+            'namespace': meta['namespace'],
+            'status': pod['status']['phase'],
+            'node': pod['spec'].get('nodeName', 'Unknown'),
+            'created': meta['creationTimestamp']
+        }
+        for pod in pods
+    ]
+
+def _list_namespaces(cluster_endpoint, cluster_ca, token):
+    """List namespaces from a cluster API endpoint, or None if the request failed"""
+    namespaces_url = f"{cluster_endpoint}/api/v1/namespaces"
+    logger.info("Calling Kubernetes API: %s", namespaces_url)
+    
+    namespaces = _list_k8s_items(namespaces_url, token, cluster_ca)
+    if namespaces is None:
+        return None
+    
+    return [
+        {
+            'name': (meta := ns['metadata'])['name'],
+            'status': ns['status']['phase'],
+            'created': meta['creationTimestamp'],
+            'labels': meta.get('labels', {})
+        }
+        for ns in namespaces
+    ]
+
+def _node_ready(node):
+    """Whether the node's Ready condition is True"""
+    conds = {condition['type']: condition['status'] for condition in node['status']['conditions']}
+    return conds.get('Ready') == 'True'
+
+def _list_nodes(cluster_endpoint, cluster_ca, token):
+    """List nodes from a cluster API endpoint, or None if the request failed"""
+    nodes_url = f"{cluster_endpoint}/api/v1/nodes"
+    logger.info("Getting nodes from: %s", nodes_url)
+    
+    nodes = _list_k8s_items(nodes_url, token, cluster_ca)
+    if nodes is None:
+        return None
+    
+    return [
+        {
+            'name': (meta := node['metadata'])['name'],
+            'status': 'Ready' if _node_ready(node) else 'NotReady',
+            'version': node['status']['nodeInfo']['kubeletVersion'],
+            'instance_type': meta['labels'].get('node.kubernetes.io/instance-type', 'Unknown'),
+            'created': meta['creationTimestamp']
+        }
+        for node in nodes
+    ]
+
+def _fetch_pods_one(cluster_name, namespace):
+    """Get the pod list for a single cluster"""
+    cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
+    if not cluster_endpoint:
+        return []
+    
+    return _list_pods(cluster_endpoint, cluster_ca, token, namespace) or []
+
+def get_pods_from_cluster(clusters, namespace="", timestamp=None):
     """Get pods from Kubernetes cluster using direct API calls"""
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
     try:
         results = []
-        
-        for cluster_name in clusters:
-            cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
-            if not cluster_endpoint:
-                continue
-            
-            # Build API URL
-            if namespace:
-                api_url = f"{cluster_endpoint}/api/v1/namespaces/{namespace}/pods"
-            else:
-                api_url = f"{cluster_endpoint}/api/v1/pods"
-            
-            logger.info(f"Getting pods from: {api_url}")
-            
-            pods_data = make_k8s_request(api_url, token)
-            if pods_data:
-                pods = []
-                for pod in pods_data.get('items', []):
-                    pod_info = {
-                        'name': pod['metadata']['name'],
-                        'namespace': pod['metadata']['namespace'],
-                        'status': pod['status']['phase'],
-                        'node': pod['spec'].get('nodeName', 'Unknown'),
-                        'created': pod['metadata']['creationTimestamp']
-                    }
-                    pods.append(pod_info)
-                results.extend(pods)
+        for pods in _map_clusters(_fetch_pods_one, clusters, namespace):
+            results.extend(pods)
         
         return {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api',
             'results': results
         }
         
     except Exception as e:
-        logger.error(f"Error getting pods: {str(e)}")
+        logger.error("Error getting pods: %s", e)
         return {
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api'
         }
 
-def get_cluster_data_with_real_kubernetes_api(clusters, namespace=""):
-    """Get comprehensive cluster data including namespaces"""
+def _fetch_cluster_data_one(cluster_name, namespace):
+    """Get namespaces, nodes and pods for a single cluster"""
+    logger.info("Processing cluster: %s", cluster_name)
+    
+    cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
+    if not cluster_endpoint:
+        return None
+    
+    # Issue the independent list calls concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        namespaces_future = executor.submit(_list_namespaces, cluster_endpoint, cluster_ca, token)
+        nodes_future = executor.submit(_list_nodes, cluster_endpoint, cluster_ca, token)
+        pods_future = executor.submit(_list_pods, cluster_endpoint, cluster_ca, token, namespace)
+        namespaces = namespaces_future.result()
+        nodes = nodes_future.result()
+        pods = pods_future.result()
+    
+    if namespaces is None:
+        return None
+    
+    cluster_info = {
+        'cluster_name': cluster_name,
+        'endpoint': cluster_endpoint,
+        'namespaces': namespaces,
+        'namespace_count': len(namespaces)
+    }
+    
+    # Bedrock caps action group responses at ~25KB, so nodes and pods are summarized.
+    # A failed list reports null counts, so it can't be mistaken for an empty cluster.
+    if nodes is None:
+        cluster_info.update(node_count=None, ready_node_count=None, nodes_error='node list unavailable')
+    else:
+        cluster_info.update(
+            node_count=len(nodes),
+            ready_node_count=sum(node['status'] == 'Ready' for node in nodes)
+        )
+    
+    if pods is None:
+        cluster_info.update(pod_count=None, pod_phases=None, pods_error='pod list unavailable')
+    else:
+        pod_phases = {}
+        for pod in pods:
+            pod_phases[pod['status']] = pod_phases.get(pod['status'], 0) + 1
+        cluster_info.update(pod_count=len(pods), pod_phases=pod_phases)
+        # A single namespace's pods are small enough to list in full
+        if namespace:
+            cluster_info['pods'] = pods
+    return cluster_info
+
+def get_cluster_data_with_real_kubernetes_api(clusters, namespace="", timestamp=None):
+    """Get cluster data: namespaces, node and pod counts, and the pods of a given namespace"""
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
     try:
-        cluster_data = []
-        
-        for cluster_name in clusters:
-            logger.info(f"Processing cluster: {cluster_name}")
-            
-            cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
-            if not cluster_endpoint:
-                continue
-            
-            # Get namespaces
-            namespaces_url = f"{cluster_endpoint}/api/v1/namespaces"
-            logger.info(f"Calling Kubernetes API: {namespaces_url}")
-            
-            namespaces_data = make_k8s_request(namespaces_url, token)
-            if namespaces_data:
-                namespaces = []
-                for ns in namespaces_data.get('items', []):
-                    ns_info = {
-                        'name': ns['metadata']['name'],
-                        'status': ns['status']['phase'],
-                        'created': ns['metadata']['creationTimestamp'],
-                        'labels': ns['metadata'].get('labels', {})
-                    }
-                    namespaces.append(ns_info)
-                
-                cluster_info = {
-                    'cluster_name': cluster_name,
-                    'endpoint': cluster_endpoint,
-                    'namespaces': namespaces,
-                    'namespace_count': len(namespaces)
-                }
-                cluster_data.append(cluster_info)
+        cluster_data = [
+            cluster_info
+            for cluster_info in _map_clusters(_fetch_cluster_data_one, clusters, namespace)
+            if cluster_info
+        ]
         
         return {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api',
             'clusters': cluster_data,
@@ -252,107 +542,114 @@ def get_cluster_data_with_real_kubernetes_api(clusters, namespace=""):
         }
         
     except Exception as e:
-        logger.error(f"Error getting cluster data: {str(e)}")
+        logger.error("Error getting cluster data: %s", e)
         return {
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api',
             'clusters': [],
             'summary': f"Error retrieving cluster data: {str(e)}"
         }
 
-def check_nodes(clusters):
+def _fetch_nodes_one(cluster_name):
+    """Get the node list for a single cluster"""
+    cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
+    if not cluster_endpoint:
+        return []
+    
+    return _list_nodes(cluster_endpoint, cluster_ca, token) or []
+
+def check_nodes(clusters, timestamp=None):
     """Check node health and status"""
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
     try:
         results = []
-        
-        for cluster_name in clusters:
-            cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
-            if not cluster_endpoint:
-                continue
-            
-            nodes_url = f"{cluster_endpoint}/api/v1/nodes"
-            logger.info(f"Getting nodes from: {nodes_url}")
-            
-            nodes_data = make_k8s_request(nodes_url, token)
-            if nodes_data:
-                nodes = []
-                for node in nodes_data.get('items', []):
-                    node_info = {
-                        'name': node['metadata']['name'],
-                        'status': 'Ready' if any(condition['type'] == 'Ready' and condition['status'] == 'True' 
-                                               for condition in node['status']['conditions']) else 'NotReady',
-                        'version': node['status']['nodeInfo']['kubeletVersion'],
-                        'instance_type': node['metadata']['labels'].get('node.kubernetes.io/instance-type', 'Unknown'),
-                        'created': node['metadata']['creationTimestamp']
-                    }
-                    nodes.append(node_info)
-                results.extend(nodes)
+        for nodes in _map_clusters(_fetch_nodes_one, clusters):
+            results.extend(nodes)
         
         return {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api',
             'results': results
         }
         
     except Exception as e:
-        logger.error(f"Error checking nodes: {str(e)}")
+        logger.error("Error checking nodes: %s", e)
         return {
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api'
         }
 
-def describe_pod(clusters, pod_name, namespace="default"):
+def _describe_pod_one(cluster_name, pod_name, namespace):
+    """Get detailed pod information from a single cluster"""
+    cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
+    if not cluster_endpoint:
+        return None
+    
+    pod_url = f"{cluster_endpoint}/api/v1/namespaces/{namespace}/pods/{pod_name}"
+    logger.info("Describing pod: %s", pod_url)
+    
+    pod_data = make_k8s_request(pod_url, token, cluster_ca=cluster_ca)
+    if not pod_data:
+        return None
+    
+    meta = pod_data['metadata']
+    spec = pod_data['spec']
+    status = pod_data['status']
+    return {
+        'name': meta['name'],
+        'namespace': meta['namespace'],
+        'status': status['phase'],
+        'node': spec.get('nodeName', 'Unknown'),
+        'created': meta['creationTimestamp'],
+        'containers': [
+            {
+                'name': container['name'],
+                'image': container['image'],
+                'ports': container.get('ports', [])
+            }
+            for container in spec['containers']
+        ],
+        'conditions': status.get('conditions', [])
+    }
+
+def describe_pod(clusters, pod_name, namespace="default", timestamp=None):
     """Get detailed pod information"""
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
     try:
-        results = []
-        
-        for cluster_name in clusters:
-            cluster_endpoint, cluster_ca, token = get_kubernetes_config(cluster_name)
-            if not cluster_endpoint:
-                continue
-            
-            pod_url = f"{cluster_endpoint}/api/v1/namespaces/{namespace}/pods/{pod_name}"
-            logger.info(f"Describing pod: {pod_url}")
-            
-            pod_data = make_k8s_request(pod_url, token)
-            if pod_data:
-                pod_info = {
-                    'name': pod_data['metadata']['name'],
-                    'namespace': pod_data['metadata']['namespace'],
-                    'status': pod_data['status']['phase'],
-                    'node': pod_data['spec'].get('nodeName', 'Unknown'),
-                    'created': pod_data['metadata']['creationTimestamp'],
-                    'containers': [],
-                    'conditions': pod_data['status'].get('conditions', [])
-                }
-                
-                for container in pod_data['spec']['containers']:
-                    container_info = {
-                        'name': container['name'],
-                        'image': container['image'],
-                        'ports': container.get('ports', [])
-                    }
-                    pod_info['containers'].append(container_info)
-                
-                results.append(pod_info)
+        results = [
+            pod_info
+            for pod_info in _map_clusters(_describe_pod_one, clusters, pod_name, namespace)
+            if pod_info
+        ]
         
         return {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api',
             'results': results
         }
         
     except Exception as e:
-        logger.error(f"Error describing pod: {str(e)}")
+        logger.error("Error describing pod: %s", e)
         return {
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             'clusters_checked': clusters,
             'data_source': 'kubernetes_api'
-        }
\ No newline at end of file
+        }
+
+# API path -> (tool function, ((parameter name, default), ...)) passed positionally after clusters
+_ROUTES = {
+    '/get-pods': (get_pods_from_cluster, (('namespace', ''),)),
+    '/analyze-namespace': (get_cluster_data_with_real_kubernetes_api, (('namespace', ''),)),
+    '/get-cluster-health': (get_cluster_data_with_real_kubernetes_api, ()),
+    '/check-nodes': (check_nodes, ()),
+    '/describe-pod': (describe_pod, (('pod_name', ''), ('namespace', 'default'))),
+}
\ No newline at end of file
@@ -111,6 +111,11 @@ resource "aws_eks_cluster" "test_cluster" {
 
   enabled_cluster_log_types = ["api", "audit"]
 
+  # Access entries let IAM roles (the token refresher) authenticate alongside aws-auth
+  access_config {
+    authentication_mode = "API_AND_CONFIG_MAP"
+  }
+
   depends_on = [
     aws_iam_role_policy_attachment.eks_cluster_policy
   ]
@@ -206,6 +211,42 @@ resource "kubernetes_secret" "bedrock_agent_token" {
   depends_on = [kubernetes_service_account.bedrock_agent]
 }
 
+# Let the token refresher read only the service account token secret
+resource "kubernetes_role" "token_refresher" {
+  metadata {
+    name      = "bedrock-token-refresher"
+    namespace = "kube-system"
+  }
+
+  rule {
+    api_groups     = [""]
+    resources      = ["secrets"]
+    resource_names = [kubernetes_secret.bedrock_agent_token.metadata[0].name]
+    verbs          = ["get"]
+  }
+
+  depends_on = [aws_eks_node_group.test_nodes]
+}
+
+resource "kubernetes_role_binding" "token_refresher" {
+  metadata {
+    name      = "bedrock-token-refresher"
+    namespace = "kube-system"
+  }
+
+  role_ref {
+    api_group = "rbac.authorization.k8s.io"
+    kind      = "Role"
+    name      = kubernetes_role.token_refresher.metadata[0].name
+  }
+
+  subject {
+    kind      = "Group"
+    name      = "bedrock-token-refresher"
+    api_group = "rbac.authorization.k8s.io"
+  }
+}
+
 # Data sources to read the created resources
 data "kubernetes_service_account" "bedrock_agent" {
   metadata {
@@ -338,6 +379,13 @@ resource "aws_iam_role_policy" "lambda_eks_policy" {
           "sts:GetCallerIdentity"
         ]
         Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem"
+        ]
+        Resource = aws_dynamodb_table.token_cache.arn
       }
     ]
   })
@@ -377,6 +425,7 @@ resource "aws_lambda_function" "k8s_tools" {
       PROJECT        = var.project_name
       LOG_LEVEL      = "INFO"
       CLUSTER_NAME   = aws_eks_cluster.test_cluster.name
+      TOKEN_CACHE_TABLE = aws_dynamodb_table.token_cache.name
     }
   }
 
@@ -401,6 +450,25 @@ resource "aws_lambda_permission" "allow_bedrock" {
 # AUTOMATED TOKEN REFRESH SYSTEM
 # =============================================================================
 
+# Shared token cache: written by the token refresher, read by the tools Lambda
+resource "aws_dynamodb_table" "token_cache" {
+  name         = "${var.project_name}-k8s-token-cache"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "CacheKey"
+
+  attribute {
+    name = "CacheKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ExpiresAt"
+    enabled        = true
+  }
+
+  tags = local.common_tags
+}
+
 # Create ZIP file for token refresher Lambda
 data "archive_file" "token_refresher_zip" {
   type        = "zip"
@@ -428,6 +496,17 @@ resource "aws_iam_role" "token_refresher_role" {
   tags = local.common_tags
 }
 
+# Map the token refresher role into the cluster; RBAC comes from the
+# bedrock-token-refresher group binding, not an access policy
+resource "aws_eks_access_entry" "token_refresher" {
+  cluster_name      = aws_eks_cluster.test_cluster.name
+  principal_arn     = aws_iam_role.token_refresher_role.arn
+  kubernetes_groups = ["bedrock-token-refresher"]
+  type              = "STANDARD"
+
+  tags = local.common_tags
+}
+
 # Basic Lambda execution policy for token refresher
 resource "aws_iam_role_policy_attachment" "token_refresher_basic_execution" {
   role       = aws_iam_role.token_refresher_role.name
@@ -445,12 +524,25 @@ resource "aws_iam_role_policy" "token_refresher_policy" {
       {
         Effect = "Allow"
         Action = [
-          "eks:DescribeCluster",
-          "lambda:UpdateFunctionConfiguration",
-          "lambda:GetFunctionConfiguration"
+          "eks:DescribeCluster"
         ]
         Resource = "*"
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem"
+        ]
+        Resource = aws_dynamodb_table.token_cache.arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:InvokeFunction"
+        ]
+        Resource = aws_lambda_function.k8s_tools.arn
+      },
       {
         Effect = "Allow"
         Action = [
@@ -486,6 +578,7 @@ resource "aws_lambda_function" "token_refresher" {
     variables = {
       TARGET_LAMBDA_FUNCTION = aws_lambda_function.k8s_tools.function_name
       CLUSTER_NAME          = aws_eks_cluster.test_cluster.name
+      TOKEN_CACHE_TABLE     = aws_dynamodb_table.token_cache.name
       LOG_LEVEL            = "INFO"
     }
   }
@@ -493,7 +586,9 @@ resource "aws_lambda_function" "token_refresher" {
   depends_on = [
     aws_iam_role_policy_attachment.token_refresher_basic_execution,
     aws_cloudwatch_log_group.token_refresher_logs,
-    kubernetes_secret.bedrock_agent_token
+    kubernetes_secret.bedrock_agent_token,
+    aws_eks_access_entry.token_refresher,
+    kubernetes_role_binding.token_refresher
   ]
 
   tags = local.common_tags
@@ -4,40 +4,51 @@ Simple token manager for Bedrock SRE Agent
 Usage: python3 token_manager.py
 """
 
-import subprocess
 import boto3
 import json
 import base64
+import time
+from kubernetes import client, config
+
+# Token cache read by the Lambda before its KUBERNETES_TOKEN fallback
+TOKEN_CACHE_TABLE = 'bedrock-sre-agent-k8s-token-cache'
+CLUSTER_NAME = 'test-cluster-production'
 
 def get_kubernetes_token():
     """Get service account token from Kubernetes"""
     try:
-        cmd = ["kubectl", "get", "secret", "bedrock-agent-token", 
-               "-n", "kube-system", "-o", "jsonpath={.data.token}"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        token_b64 = result.stdout.strip()
-        token = base64.b64decode(token_b64).decode('utf-8')
+        # Uses the same kubeconfig context as kubectl
+        config.load_kube_config()
+        core_v1 = client.CoreV1Api()
+        secret = core_v1.read_namespaced_secret('bedrock-agent-token', 'kube-system')
+        token = base64.b64decode(secret.data['token']).decode('utf-8')
         return token
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Error getting token: {e}")
         return None
 
 def update_lambda_token(token):
-    """Update Lambda environment with new token"""
+    """Publish the token to the Lambda's token cache"""
     try:
+        dynamodb_client = boto3.client('dynamodb', region_name='eu-central-1')
         lambda_client = boto3.client('lambda', region_name='eu-central-1')
         
-        env_vars = {
-            "LOG_LEVEL": "INFO",
-            "KUBERNETES_TOKEN": token,
-            "CLUSTER_NAME": "test-cluster-production",
-            "ENVIRONMENT": "production",
-            "PROJECT": "bedrock-sre-agent"
-        }
+        # The cache takes precedence over KUBERNETES_TOKEN, so replace the cached token.
+        # Secret-based tokens never expire, so the item gets no ExpiresAt (the table's TTL).
+        dynamodb_client.put_item(
+            TableName=TOKEN_CACHE_TABLE,
+            Item={
+                'CacheKey': {'S': f"{CLUSTER_NAME}:token"},
+                'Token': {'S': token},
+                'IssuedAt': {'N': str(int(time.time()))}
+            }
+        )
         
-        response = lambda_client.update_function_configuration(
+        # Warm containers keep tokens in memory for up to 5 minutes; the ping clears the one it reaches
+        lambda_client.invoke(
             FunctionName='k8s-sre-tools',
-            Environment={'Variables': env_vars}
+            InvocationType='Event',
+            Payload=json.dumps({'refresh_token': True})
         )
         
         print("✅ Lambda token updated successfully!")
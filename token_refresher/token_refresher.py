@@ -3,92 +3,281 @@ import boto3
 import base64
 import os
 import logging
-from datetime import datetime
+import ssl
+import time
+import urllib3
+from botocore.config import Config
+from botocore.signers import RequestSigner
+
+# orjson is used when it is vendored into the deployment package; the stock
+# Lambda runtime only ships the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Deployment configuration, resolved once per container
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+TARGET_FUNCTION = os.environ.get('TARGET_LAMBDA_FUNCTION')
+CLUSTER_NAME = os.environ.get('CLUSTER_NAME')
 
 # Set up logging
 logger = logging.getLogger()
-logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+logger.setLevel(LOG_LEVEL)
+
+# Service account token secret created by Terraform
+TOKEN_SECRET_NAME = 'bedrock-agent-token'
+TOKEN_SECRET_NAMESPACE = 'kube-system'
+
+# DynamoDB table shared with the tools Lambda, which reads tokens from it
+TOKEN_CACHE_TABLE = os.environ.get('TOKEN_CACHE_TABLE')
+# Tokens without an exp claim (legacy secret-based tokens) never expire; they are
+# cached without ExpiresAt and only re-read from the secret once this old
+TOKEN_MAX_AGE_SECONDS = 21600
+# Cached tokens are expired this long before the token itself does
+TOKEN_EXPIRY_BUFFER_SECONDS = 900
+# Matches the EventBridge schedule; a cached token must outlive the next run
+TOKEN_REFRESH_INTERVAL_SECONDS = 3600
+
+# AWS clients are created once per container and reused across warm invocations
+SESSION = boto3.session.Session()
+CLIENT_CONFIG = Config(tcp_keepalive=True)
+LAMBDA_CLIENT = SESSION.client(
+    'lambda',
+    config=CLIENT_CONFIG.merge(Config(
+        max_pool_connections=50,
+        retries={'mode': 'adaptive', 'max_attempts': 3}
+    ))
+)
+EKS_CLIENT = SESSION.client('eks', config=CLIENT_CONFIG)
+STS_CLIENT = SESSION.client('sts', config=CLIENT_CONFIG)
+DYNAMODB_CLIENT = SESSION.client('dynamodb', config=CLIENT_CONFIG)
+
+# Kubernetes API pools keyed by cluster CA, reused across warm invocations so
+# repeated secret reads go over the same keep-alive connections
+_CLUSTER_HTTP = {}
+
+# EKS endpoint/CA per cluster; the cluster is static per deployment
+_CLUSTER_INFO = {}
+
+def _dumps(obj):
+    """Serialize obj to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def _loads(data):
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def lambda_handler(event, context):
     """Automatically refresh Kubernetes service account tokens"""
+    # Misconfiguration can't be fixed by retrying; reject before any AWS call
+    missing = [name for name, value in (('TARGET_LAMBDA_FUNCTION', TARGET_FUNCTION),
+                                        ('CLUSTER_NAME', CLUSTER_NAME),
+                                        ('TOKEN_CACHE_TABLE', TOKEN_CACHE_TABLE)) if not value]
+    if missing:
+        logger.error("❌ Missing environment variables: %s", ', '.join(missing))
+        return {'statusCode': 400, 'body': _dumps({'error': f"Missing environment variables: {', '.join(missing)}"})}
+
     try:
         logger.info("Starting automatic token refresh...")
         
-        target_function = os.environ.get('TARGET_LAMBDA_FUNCTION')
-        cluster_name = os.environ.get('CLUSTER_NAME')
+        logger.info("Target function: %s", TARGET_FUNCTION)
+        logger.info("Cluster name: %s", CLUSTER_NAME)
         
-        logger.info(f"Target function: {target_function}")
-        logger.info(f"Cluster name: {cluster_name}")
+        # Nothing to do while a never-expiring cached token is recent, or an expiring one
+        # is unexpired and was either published since the last run or outlives the next one
+        issued_at, expires_at = get_cached_token_window(CLUSTER_NAME)
+        now = time.time()
+        if expires_at is None:
+            cache_hit = issued_at and now - issued_at < TOKEN_MAX_AGE_SECONDS
+        else:
+            cache_hit = expires_at > now and (
+                now - issued_at < TOKEN_REFRESH_INTERVAL_SECONDS
+                or expires_at - now > TOKEN_REFRESH_INTERVAL_SECONDS)
+        if cache_hit:
+            logger.info("✅ Cache hit, no refresh needed")
+            return {'statusCode': 200, 'body': _dumps({'message': 'Cache hit, no refresh needed'})}
         
         # Get fresh token
-        token = get_kubernetes_token(cluster_name)
+        token = get_kubernetes_token(CLUSTER_NAME)
         if not token:
             raise Exception("Failed to get Kubernetes token")
         
-        # Update Lambda environment
-        success = update_lambda_environment(target_function, token, cluster_name)
+        # Publish to the shared token cache read by the tools Lambda
+        success = put_cached_token(CLUSTER_NAME, token)
         
         if success:
+            # Fire-and-forget: the target drops its in-process token and rereads the cache
+            notify_target_function(TARGET_FUNCTION)
             logger.info("✅ Token refresh completed successfully")
-            return {'statusCode': 200, 'body': json.dumps({'message': 'Token updated successfully'})}
+            return {'statusCode': 200, 'body': _dumps({'message': 'Token updated successfully'})}
         else:
-            raise Exception("Failed to update Lambda environment")
+            raise Exception("Failed to update token cache")
         
     except Exception as e:
-        logger.error(f"❌ Error in token refresh: {str(e)}")
-        return {'statusCode': 500, 'body': json.dumps({'error': str(e)})}
+        logger.error("❌ Error in token refresh: %s", e)
+        return {'statusCode': 500, 'body': _dumps({'error': str(e)})}
+
+def _get_cluster_http(cluster_ca):
+    """Return a pool whose TLS context trusts the given base64 cluster CA"""
+    http = _CLUSTER_HTTP.get(cluster_ca)
+    if http is None:
+        ssl_context = ssl.create_default_context(cadata=base64.b64decode(cluster_ca).decode('ascii'))
+        http = _CLUSTER_HTTP.setdefault(
+            cluster_ca, urllib3.PoolManager(ssl_context=ssl_context, maxsize=10, block=False)
+        )
+    return http
+
+def _describe_cluster(cluster_name):
+    """Get the cluster's API endpoint and base64 CA, cached per container"""
+    cluster_info = _CLUSTER_INFO.get(cluster_name)
+    if cluster_info is None:
+        cluster = EKS_CLIENT.describe_cluster(name=cluster_name)['cluster']
+        cluster_info = (cluster['endpoint'], cluster['certificateAuthority']['data'])
+        _CLUSTER_INFO[cluster_name] = cluster_info
+    return cluster_info
+
+def _get_eks_auth_token(cluster_name):
+    """Build an EKS bearer token from a presigned STS GetCallerIdentity URL, as `aws eks get-token` does"""
+    region = STS_CLIENT.meta.region_name
+    
+    signer = RequestSigner(
+        STS_CLIENT.meta.service_model.service_id,
+        region,
+        'sts',
+        'v4',
+        SESSION.get_credentials(),
+        SESSION.events
+    )
+    presigned_url = signer.generate_presigned_url(
+        {
+            'method': 'GET',
+            'url': f"https://sts.{region}.amazonaws.com/?Action=GetCallerIdentity&Version=2011-06-15",
+            'body': {},
+            'headers': {'x-k8s-aws-id': cluster_name},
+            'context': {}
+        },
+        region_name=region,
+        expires_in=60,
+        operation_name=''
+    )
+    
+    return 'k8s-aws-v1.' + base64.urlsafe_b64encode(presigned_url.encode('utf-8')).decode('utf-8').rstrip('=')
 
 def get_kubernetes_token(cluster_name):
-    """Get service account token using AWS CLI approach"""
+    """Get service account token by reading its secret from the Kubernetes API"""
     try:
-        import subprocess
-        
-        # Configure kubectl context first
-        subprocess.run([
-            'aws', 'eks', 'update-kubeconfig', 
-            '--region', 'eu-central-1',
-            '--name', cluster_name
-        ], check=True, capture_output=True)
-        
-        # Get token from secret
-        result = subprocess.run([
-            'kubectl', 'get', 'secret', 'bedrock-agent-token',
-            '-n', 'kube-system', 
-            '-o', 'jsonpath={.data.token}'
-        ], capture_output=True, text=True, check=True)
-        
-        token_b64 = result.stdout.strip()
+        cluster_endpoint, cluster_ca = _describe_cluster(cluster_name)
+        
+        secret_url = (f"{cluster_endpoint}/api/v1/namespaces/{TOKEN_SECRET_NAMESPACE}"
+                      f"/secrets/{TOKEN_SECRET_NAME}")
+        headers = {
+            'Authorization': f'Bearer {_get_eks_auth_token(cluster_name)}',
+            'Accept': 'application/json'
+        }
+        
+        http = _get_cluster_http(cluster_ca)
+        response = http.request('GET', secret_url, headers=headers, timeout=30.0, preload_content=False)
+        try:
+            body = response.read()
+        finally:
+            response.release_conn()
+        
+        if response.status != 200:
+            raise Exception(f"Kubernetes API error: {response.status} - "
+                            f"{body.decode('utf-8', errors='replace')}")
+        
+        # Only the token field is used; decode it straight from the raw secret bytes
+        token_b64 = _loads(body).get('data', {}).get('token')
+        if not token_b64:
+            raise Exception(f"Secret {TOKEN_SECRET_NAMESPACE}/{TOKEN_SECRET_NAME} has no token yet")
         token = base64.b64decode(token_b64).decode('utf-8')
         
-        logger.info(f"Retrieved token (length: {len(token)} characters)")
+        logger.info("Retrieved token (length: %d characters)", len(token))
         return token
         
     except Exception as e:
-        logger.error(f"Error getting Kubernetes token: {str(e)}")
+        logger.error("Error getting Kubernetes token: %s", e)
         return None
 
-def update_lambda_environment(function_name, token, cluster_name):
-    """Update target Lambda function environment with new token"""
+def _token_cache_key(cluster_name):
+    """DynamoDB partition key for a cluster's token"""
+    return f"{cluster_name}:token"
+
+def _token_expiry(token):
+    """Return the token's JWT exp claim, or None if it has no usable one"""
     try:
-        lambda_client = boto3.client('lambda')
-        
-        env_vars = {
-            'LOG_LEVEL': 'INFO',
-            'KUBERNETES_TOKEN': token,
-            'CLUSTER_NAME': cluster_name,
-            'ENVIRONMENT': 'production',
-            'PROJECT': 'bedrock-sre-agent',
-            'TOKEN_UPDATED': datetime.utcnow().isoformat()
+        payload = token.split('.')[1]
+        claims = _loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except (IndexError, ValueError, TypeError):
+        return None
+    
+    exp = claims.get('exp') if isinstance(claims, dict) else None
+    # bool is an int subclass but never a valid exp
+    if isinstance(exp, int) and not isinstance(exp, bool):
+        return exp
+    return None
+
+def get_cached_token_window(cluster_name):
+    """Get (issued_at, expires_at) epoch seconds of the cluster's cached token.
+    
+    expires_at is None for tokens that never expire; (0, None) means there is no cached token.
+    """
+    try:
+        item = DYNAMODB_CLIENT.get_item(
+            TableName=TOKEN_CACHE_TABLE,
+            Key={'CacheKey': {'S': _token_cache_key(cluster_name)}}
+        ).get('Item')
+        if not item:
+            return 0, None
+        # Items written before IssuedAt was recorded only carry their expiry
+        issued_at = int(item.get('IssuedAt', {}).get('N', 0))
+        expires_at = int(item['ExpiresAt']['N']) if 'ExpiresAt' in item else None
+        return issued_at, expires_at
+        
+    except Exception as e:
+        logger.error("Error reading token cache: %s", e)
+        return 0, None
+
+def put_cached_token(cluster_name, token):
+    """Store the token in the shared DynamoDB token cache"""
+    try:
+        item = {
+            'CacheKey': {'S': _token_cache_key(cluster_name)},
+            'Token': {'S': token},
+            'IssuedAt': {'N': str(int(time.time()))}
         }
+        # ExpiresAt is also the table's TTL attribute, so it is only set for tokens
+        # that actually expire; the others stay usable if refreshes start failing
+        token_expiry = _token_expiry(token)
+        if token_expiry is not None:
+            item['ExpiresAt'] = {'N': str(int(token_expiry - TOKEN_EXPIRY_BUFFER_SECONDS))}
+        
+        DYNAMODB_CLIENT.put_item(TableName=TOKEN_CACHE_TABLE, Item=item)
+        
+        logger.info("Stored token for %s in %s", cluster_name, TOKEN_CACHE_TABLE)
+        return True
         
-        lambda_client.update_function_configuration(
+    except Exception as e:
+        logger.error("Error updating token cache: %s", e)
+        return False
+
+def notify_target_function(function_name):
+    """Asynchronously ping the target Lambda so it picks up the new token"""
+    try:
+        LAMBDA_CLIENT.invoke(
             FunctionName=function_name,
-            Environment={'Variables': env_vars}
+            InvocationType='Event',
+            Payload=b'{"refresh_token": true}'
         )
         
-        logger.info(f"Updated Lambda {function_name} with new token")
+        logger.info("Notified Lambda %s of the new token", function_name)
         return True
         
     except Exception as e:
-        logger.error(f"Error updating Lambda environment: {str(e)}")
+        logger.error("Error notifying Lambda %s: %s", function_name, e)
         return False